@@ -7,9 +7,94 @@ Created on Fri Dec 20 12:12:31 2019
 """
 
 import os
+import functools
+
+# use the faster orjson parser, if available
+try:
+    from orjson import loads
+
+except ImportError:
+    from json import loads
+
+from pyUSIrest.settings import ROOT_URL
 
 # get my path
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
 # define data path
 DATA_PATH = os.path.join(dir_path, "data")
+
+# map each JSON file name to its path
+DATA_FILES = {
+    filename: os.path.join(DATA_PATH, filename)
+    for filename in os.listdir(DATA_PATH) if filename.endswith(".json")
+}
+
+# define mocked API endpoints
+API_URL = ROOT_URL + "/api"
+SUBMISSIONS_URL = API_URL + "/submissions"
+
+# the submission described by newSubmission.json
+NEW_SUBMISSION_URL = (
+    SUBMISSIONS_URL + "/c8c86558-8d3a-4ac5-8638-7aa354291d61")
+
+
+def _read_json(path):
+    """Parse a JSON file"""
+
+    with open(path) as handle:
+        return loads(handle.read())
+
+
+# parse every JSON file once, when this module is imported
+DATA = {filename: _read_json(path) for filename, path in DATA_FILES.items()}
+
+
+def load_json(filename):
+    """Return a JSON file from DATA_PATH. Files are parsed at import time and
+    the same plain ``dict`` or ``list`` is returned to every caller, like
+    :py:meth:`requests.Response.json` does: never modify it, make a copy
+    of the items you need to change instead"""
+
+    return DATA[filename]
+
+
+class MockResponse():
+    """A lightweight replacement of :py:class:`requests.Response` having
+    ``json()``, ``status_code`` and ``text``: cheaper than configuring a
+    :py:class:`unittest.mock.Mock` object"""
+
+    __slots__ = ('json_data', 'status_code', 'text')
+
+    def __init__(self, json_data=None, status_code=200, text=None):
+        self.json_data = json_data
+        self.status_code = status_code
+        self.text = text
+
+    def json(self):
+        return self.json_data
+
+
+# a default reply for URLs not managed by mocked requests
+NOT_FOUND = MockResponse(status_code=404, text="MockResponse not implemented")
+
+# the reply of a successful DELETE request
+NO_CONTENT = MockResponse(status_code=204)
+
+
+def with_mock_response(filename, method='get', status_code=200):
+    """Decorate a test method in order to set a :py:class:`MockResponse`
+    with the content of ``filename`` as the ``mock_<method>`` return value.
+    The response is created once, when the test is defined"""
+
+    response = MockResponse(load_json(filename), status_code=status_code)
+
+    def decorator(test):
+        @functools.wraps(test)
+        def wrapper(self, *args, **kwargs):
+            getattr(self, "mock_%s" % (method)).return_value = response
+            return test(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 16 10:12:47 2026
+
+@author: Paolo Cozzi <paolo.cozzi@ibba.cnr.it>
+"""
+
+import pytest
+
+from unittest.mock import patch, DEFAULT
+
+from .common import MockResponse
+
+
+@pytest.fixture(scope="class")
+def session_mocks(request):
+    """Patch ``requests.Session`` methods once for a whole test class. Mocks
+    are returned as a dictionary and are set as ``mock_<method>`` class
+    attributes, in order to be used inside ``unittest.TestCase`` methods"""
+
+    with patch.multiple(
+            'requests.Session',
+            get=DEFAULT,
+            post=DEFAULT,
+            put=DEFAULT,
+            patch=DEFAULT,
+            delete=DEFAULT) as mocks:
+
+        for method, mock in mocks.items():
+            setattr(request.cls, "mock_%s" % (method), mock)
+
+        yield mocks
+
+
+@pytest.fixture(autouse=True)
+def reset_session_mocks(request):
+    """Reset the ``requests.Session`` mocks before each test of the classes
+    using ``session_mocks``: calls are forgotten, ``side_effect`` is removed
+    and every method returns an empty :py:class:`MockResponse` with a 200
+    status code, unless a test sets something different"""
+
+    if "session_mocks" not in request.fixturenames:
+        return
+
+    for mock in request.getfixturevalue("session_mocks").values():
+        mock.reset_mock()
+        mock.side_effect = None
+        mock.return_value = MockResponse({})
@@ -7,6 +7,7 @@ Created on Thu Jul 12 11:54:50 2018
 """
 
 import datetime
+import functools
 import python_jwt
 
 from unittest.mock import patch, Mock
@@ -39,6 +40,14 @@ def generate_token(now=None, domains=['subs.test-team-1']):
         algorithm='RS256')
 
 
+@functools.lru_cache(maxsize=None)
+def get_token():
+    """Return a valid 'fake' token. The token is generated once and then
+    shared between tests, and it will expire in one hour"""
+
+    return generate_token()
+
+
 class TestAuth(TestCase):
     @classmethod
     def setup_class(cls):
@@ -52,7 +61,7 @@ class TestAuth(TestCase):
     def setUp(self):
         # Configure the mock to return a response with an OK status code.
         self.mock_get.return_value = Mock()
-        self.mock_get.return_value.text = generate_token()
+        self.mock_get.return_value.text = get_token()
         self.mock_get.return_value.status_code = 200
         self.now = int(datetime.datetime.now().timestamp())
 
@@ -66,7 +75,7 @@ class TestAuth(TestCase):
         self.assertFalse(auth.is_expired())
 
     def test_with_tocken(self):
-        auth = Auth(token=generate_token())
+        auth = Auth(token=get_token())
 
         # If the request is sent successfully, then I expect a response to
         # be returned.
@@ -82,7 +91,7 @@ class TestAuth(TestCase):
 
     def test_invalid_status(self):
         self.mock_get.return_value = Mock()
-        self.mock_get.return_value.text = generate_token()
+        self.mock_get.return_value.text = get_token()
         self.mock_get.return_value.status_code = 400
 
         self.assertRaisesRegex(
@@ -6,11 +6,9 @@ Created on Fri Dec 20 11:53:11 2019
 @author: Paolo Cozzi <paolo.cozzi@ibba.cnr.it>
 """
 
-import os
-import json
 import datetime
+import pytest
 
-from unittest.mock import patch, Mock
 from unittest import TestCase
 
 from pyUSIrest.auth import Auth
@@ -19,8 +17,8 @@ from pyUSIrest.settings import ROOT_URL
 from pyUSIrest.exceptions import (
     USIConnectionError, TokenExpiredError, USIDataError)
 
-from .common import DATA_PATH
-from .test_auth import generate_token
+from .common import load_json, MockResponse
+from .test_auth import generate_token, get_token
 
 
 class ISDateTest(TestCase):
@@ -33,23 +31,15 @@ class ISDateTest(TestCase):
         self.assertFalse(is_date("not a date"))
 
 
+@pytest.mark.usefixtures("session_mocks")
 class ClientTest(TestCase):
-    @classmethod
-    def setup_class(cls):
-        cls.mock_get_patcher = patch('requests.Session.get')
-        cls.mock_get = cls.mock_get_patcher.start()
-
-    @classmethod
-    def teardown_class(cls):
-        cls.mock_get_patcher.stop()
-
     def test_with_tocken_str(self):
-        token = generate_token()
+        token = get_token()
         client = Client(token)
         self.assertFalse(client.auth.is_expired())
 
     def test_with_auth_object(self):
-        token = generate_token()
+        token = get_token()
         auth = Auth(token=token)
         client = Client(auth)
         self.assertFalse(client.auth.is_expired())
@@ -71,16 +61,14 @@ class ClientTest(TestCase):
     def test_server_error(self):
         """Deal with the generic 50x states"""
 
-        token = generate_token()
+        token = get_token()
         client = Client(token)
 
         # create a mock response
-        response = Mock()
-        response.status_code = 500
-        response.text = (
+        response = MockResponse(status_code=500, text=(
             '<!DOCTYPE html>\n<html>\n<body>\n<meta http-equiv="refresh" '
             'content=\'0;URL=http://www.ebi.ac.uk/errors/failure.html\'>\n'
-            '</body>\n</html>\n')
+            '</body>\n</html>\n'))
 
         self.mock_get.return_value = response
 
@@ -95,14 +83,9 @@ class ClientTest(TestCase):
         """Testing a get method"""
 
         # create a mock response
-        with open(os.path.join(DATA_PATH, "root.json")) as handle:
-            data = json.load(handle)
+        self.mock_get.return_value = MockResponse(load_json("root.json"))
 
-        self.mock_get.return_value = Mock()
-        self.mock_get.return_value.json.return_value = data
-        self.mock_get.return_value.status_code = 200
-
-        token = generate_token()
+        token = get_token()
         client = Client(token)
 
         response = client.get(ROOT_URL, headers={'new_key': 'new_value'})
@@ -113,15 +96,10 @@ class ClientTest(TestCase):
         """Testing a get method with a different status code than expected"""
 
         # create a mock response
-        with open(os.path.join(DATA_PATH, "root.json")) as handle:
-            data = json.load(handle)
-
-        self.mock_get.return_value = Mock()
-        self.mock_get.return_value.json.return_value = data
-        self.mock_get.return_value.text = "test message"
-        self.mock_get.return_value.status_code = 201
+        self.mock_get.return_value = MockResponse(
+            load_json("root.json"), status_code=201, text="test message")
 
-        token = generate_token()
+        token = get_token()
         client = Client(token)
 
         self.assertRaisesRegex(
@@ -135,13 +113,11 @@ class ClientTest(TestCase):
         """Deal with problems with getting URL (no 200 status code)"""
 
         # create a mock response
-        response = Mock()
-        response.status_code = 404
-        response.text = (
+        response = MockResponse(status_code=404, text=(
             '<h1>Not Found</h1><p>The requested resource was not found on '
-            'this server.</p>')
+            'this server.</p>'))
 
-        token = generate_token()
+        token = get_token()
         client = Client(token)
 
         self.mock_get.return_value = response
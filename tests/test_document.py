@@ -6,38 +6,30 @@ Created on Tue Jan  7 14:56:39 2020
 @author: Paolo Cozzi <paolo.cozzi@ibba.cnr.it>
 """
 
-import os
-import json
 import types
+import pytest
 
-from unittest.mock import patch, Mock
+from unittest.mock import Mock
 from unittest import TestCase
 
 from pyUSIrest.auth import Auth
 from pyUSIrest.client import Document
 
-from .common import DATA_PATH
-from .test_auth import generate_token
+from .common import load_json
+from .test_auth import get_token
 
 
+@pytest.mark.usefixtures("session_mocks")
 class DocumentTest(TestCase):
     @classmethod
     def setup_class(cls):
-        cls.mock_get_patcher = patch('requests.Session.get')
-        cls.mock_get = cls.mock_get_patcher.start()
-
         # define an auth object
-        token = generate_token()
+        token = get_token()
         cls.auth = Auth(token=token)
 
-    @classmethod
-    def teardown_class(cls):
-        cls.mock_get_patcher.stop()
-
     def test_create_document(self):
         # create a mock response
-        with open(os.path.join(DATA_PATH, "root.json")) as handle:
-            data = json.load(handle)
+        data = load_json("root.json")
 
         # get a document instance
         document = Document(auth=self.auth, data=data)
@@ -45,13 +37,8 @@ class DocumentTest(TestCase):
         self.assertIsInstance(document, Document)
 
     def test_paginate(self):
-        with open(os.path.join(
-                DATA_PATH, "userSubmissionsPage1.json")) as handle:
-            page1 = json.load(handle)
-
-        with open(os.path.join(
-                DATA_PATH, "userSubmissionsPage2.json")) as handle:
-            page2 = json.load(handle)
+        page1 = load_json("userSubmissionsPage1.json")
+        page2 = load_json("userSubmissionsPage2.json")
 
         self.mock_get.return_value = Mock()
 
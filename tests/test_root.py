@@ -6,12 +6,10 @@ Created on Fri Jan 10 11:28:10 2020
 @author: Paolo Cozzi <paolo.cozzi@ibba.cnr.it>
 """
 
-import os
-import json
 import types
+import pytest
 
-from collections import defaultdict
-from unittest.mock import patch, Mock
+from unittest.mock import patch
 from unittest import TestCase
 
 from pyUSIrest.auth import Auth
@@ -19,29 +17,44 @@ from pyUSIrest.usi import Root, Team, Submission
 from pyUSIrest.settings import ROOT_URL
 from pyUSIrest.exceptions import USIConnectionError, USIDataError
 
-from .common import DATA_PATH
-from .test_auth import generate_token
-
-
+from .common import (
+    API_URL, SUBMISSIONS_URL, NEW_SUBMISSION_URL, load_json, MockResponse,
+    NOT_FOUND)
+from .test_auth import get_token
+
+# replies used to test user submissions and get_submission_by_name
+GET_SUBMISSION_REPLIES = {
+    API_URL + "/user/submissions":
+        MockResponse(load_json("userSubmissionsPage1.json")),
+    API_URL + "/user/submissions?page=1&size=1":
+        MockResponse(load_json("userSubmissionsPage2.json")),
+    SUBMISSIONS_URL + "/87e7abda-81a8-4b5e-a1c0-323f7f0a4e43/submissionStatus":
+        MockResponse(load_json("submissionStatus1.json")),
+    SUBMISSIONS_URL + "/8b05e7f2-92c1-4651-94cb-9101f351f000/submissionStatus":
+        MockResponse(load_json("submissionStatus2.json")),
+    NEW_SUBMISSION_URL:
+        MockResponse(load_json("newSubmission.json")),
+    NEW_SUBMISSION_URL + "/submissionStatus":
+        MockResponse(load_json("submissionStatus2.json")),
+}
+
+
+def mocked_get_submission(*args, **kwargs):
+    return GET_SUBMISSION_REPLIES.get(args[0], NOT_FOUND)
+
+
+@pytest.mark.usefixtures("session_mocks")
 class RootTest(TestCase):
     @classmethod
     def setup_class(cls):
-        cls.mock_get_patcher = patch('requests.Session.get')
-        cls.mock_get = cls.mock_get_patcher.start()
+        # define an auth object
+        cls.auth = Auth(token=get_token())
 
-    @classmethod
-    def teardown_class(cls):
-        cls.mock_get_patcher.stop()
+        # the response used to create a root object
+        cls.root_response = MockResponse(load_json("root.json"))
 
     def setUp(self):
-        self.auth = Auth(token=generate_token())
-
-        with open(os.path.join(DATA_PATH, "root.json")) as handle:
-            data = json.load(handle)
-
-        self.mock_get.return_value = Mock()
-        self.mock_get.return_value.json.return_value = data
-        self.mock_get.return_value.status_code = 200
+        self.mock_get.return_value = self.root_response
 
         # get a root object
         self.root = Root(self.auth)
@@ -54,12 +67,9 @@ class RootTest(TestCase):
         self.assertEqual(reference, test)
 
     def read_userTeams(self, filename="userTeams.json"):
-        with open(os.path.join(DATA_PATH, filename)) as handle:
-            data = json.load(handle)
+        data = load_json(filename)
 
-        self.mock_get.return_value = Mock()
-        self.mock_get.return_value.json.return_value = data
-        self.mock_get.return_value.status_code = 200
+        self.mock_get.return_value = MockResponse(data)
 
     def test_get_user_teams(self):
         # initialize
@@ -103,75 +113,6 @@ class RootTest(TestCase):
             self.root.get_team_by_name,
             "subs.dev-team-2")
 
-    def mocked_get_submission(*args, **kwargs):
-        class MockResponse:
-            def __init__(self, json_data, status_code):
-                self.json_data = json_data
-                self.status_code = status_code
-                self.text = "MockResponse not implemented: %s" % (args[0])
-
-            def json(self):
-                return self.json_data
-
-        # this variable will collect all replies
-        replies = defaultdict(lambda: MockResponse(None, 404))
-
-        # a custom function to set up replies for link
-        def set_reply(url, filename, status=200):
-            # referring to the upper replies variable
-            nonlocal replies
-
-            # open data file
-            with open(os.path.join(DATA_PATH, filename)) as handle:
-                data = json.load(handle)
-
-            # track reply to URL
-            replies[url] = MockResponse(data, status)
-
-        submission_prefix = "https://submission-test.ebi.ac.uk/api/submissions"
-        status_suffix = "submissionStatus"
-
-        status_link1 = "/".join([
-            submission_prefix,
-            "87e7abda-81a8-4b5e-a1c0-323f7f0a4e43",
-            status_suffix])
-
-        status_link2 = "/".join([
-            submission_prefix,
-            "8b05e7f2-92c1-4651-94cb-9101f351f000",
-            status_suffix])
-
-        # --- to test get_submission_by_name
-        byname_link = "/".join([
-            submission_prefix, "c8c86558-8d3a-4ac5-8638-7aa354291d61"])
-
-        status_link3 = "/".join([
-            submission_prefix,
-            "c8c86558-8d3a-4ac5-8638-7aa354291d61",
-            status_suffix])
-
-        # --- for each url, return a different response
-        set_reply(
-            'https://submission-test.ebi.ac.uk/api/user/submissions',
-            "userSubmissionsPage1.json")
-
-        set_reply(
-            'https://submission-test.ebi.ac.uk/api/user/submissions'
-            '?page=1&size=1',
-            "userSubmissionsPage2.json")
-
-        set_reply(status_link1, "submissionStatus1.json")
-
-        set_reply(status_link2, "submissionStatus2.json")
-
-        set_reply(byname_link, "newSubmission.json")
-
-        set_reply(byname_link, "newSubmission.json")
-
-        set_reply(status_link3, "submissionStatus2.json")
-
-        return replies[args[0]]
-
     @patch('requests.Session.get', side_effect=mocked_get_submission)
     def test_get_user_submissions(self, mock_get):
         # get userSubmissions
@@ -226,9 +167,7 @@ class RootTest(TestCase):
     def test_get_submission_not_found(self):
         """Test get a submission with a wrong name"""
 
-        self.mock_get.return_value = Mock()
-        self.mock_get.return_value.json.return_value = ''
-        self.mock_get.return_value.status_code = 404
+        self.mock_get.return_value = MockResponse('', status_code=404)
 
         self.assertRaisesRegex(
             NameError,
@@ -237,10 +176,9 @@ class RootTest(TestCase):
             submission_name='c8c86558-8d3a-4ac5-8638-7aa354291d61')
 
         # a different 40x error type
-        self.mock_get.return_value = Mock()
-        self.mock_get.return_value.text = (
-            "The request did not include an Authorization header")
-        self.mock_get.return_value.status_code = 401
+        self.mock_get.return_value = MockResponse(
+            text="The request did not include an Authorization header",
+            status_code=401)
 
         self.assertRaisesRegex(
             USIDataError,
@@ -248,8 +186,7 @@ class RootTest(TestCase):
             self.root.get_submission_by_name,
             submission_name='c8c86558-8d3a-4ac5-8638-7aa354291d61')
 
-        self.mock_get.return_value = Mock()
-        self.mock_get.return_value.status_code = 500
+        self.mock_get.return_value = MockResponse(status_code=500)
 
         self.assertRaises(
             USIConnectionError,
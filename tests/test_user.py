@@ -6,58 +6,63 @@ Created on Fri Jan 10 11:31:25 2020
 @author: Paolo Cozzi <paolo.cozzi@ibba.cnr.it>
 """
 
-import os
-import json
+import re
 import types
+import pytest
 
-from unittest.mock import patch, Mock
 from unittest import TestCase
 
 from pyUSIrest.auth import Auth
 from pyUSIrest.usi import Team, User, Domain
 
-from .common import DATA_PATH
-from .test_auth import generate_token
+from .common import load_json, MockResponse
+from .test_auth import get_token
+
+# error messages raised when searching for missing teams or domains
+TEAM_NOT_FOUND = re.compile(r"team: .* not found")
+DOMAIN_NOT_FOUND = re.compile(r"domain: .* not found")
+
+# the user returned by the AAP users endpoint
+USER_DATA = {
+    "userName": "foo",
+    "email": "foo.bar@email.com",
+    "userReference": "usr-f1801430-51e1-4718-8fca-778887087bad",
+    "_links": {
+        "self": {
+            "href": "https://explore.api.aai.ebi.ac.uk/users/usr-"
+                    "f1801430-51e1-4718-8fca-778887087bad"
+        }
+    }
+}
 
 
+@pytest.mark.usefixtures("session_mocks")
 class UserTest(TestCase):
     @classmethod
     def setup_class(cls):
-        cls.mock_get_patcher = patch('requests.Session.get')
-        cls.mock_get = cls.mock_get_patcher.start()
+        # define an auth object
+        cls.auth = Auth(token=get_token())
 
-        cls.mock_post_patcher = patch('requests.Session.post')
-        cls.mock_post = cls.mock_post_patcher.start()
+        # build responses once: tests only read from them
+        cls.user_response = MockResponse(USER_DATA)
 
-        cls.mock_put_patcher = patch('requests.Session.put')
-        cls.mock_put = cls.mock_put_patcher.start()
+        cls.create_user_response = MockResponse(
+            text="usr-2a28ca65-2c2f-41e7-9aa5-e829830c6c71")
 
-    @classmethod
-    def teardown_class(cls):
-        cls.mock_get_patcher.stop()
-        cls.mock_post_patcher.stop()
-        cls.mock_put_patcher.stop()
+        cls.new_team_response = MockResponse(
+            load_json("newTeam.json"), status_code=201)
+
+        cls.teams_response = MockResponse(load_json("userTeams.json"))
+
+        cls.user2team_response = MockResponse(load_json("user2team.json"))
+
+        cls.domains_response = MockResponse(load_json("myDomain.json"))
 
     def setUp(self):
-        self.auth = Auth(token=generate_token())
         self.user = User(self.auth)
 
-        self.data = {
-            "userName": "foo",
-            "email": "foo.bar@email.com",
-            "userReference": "usr-f1801430-51e1-4718-8fca-778887087bad",
-            "_links": {
-                "self": {
-                    "href": "https://explore.api.aai.ebi.ac.uk/users/usr-"
-                             "f1801430-51e1-4718-8fca-778887087bad"
-                }
-            }
-        }
-
     def test_get_user_by_id(self):
-        self.mock_get.return_value = Mock()
-        self.mock_get.return_value.json.return_value = self.data
-        self.mock_get.return_value.status_code = 200
+        self.mock_get.return_value = self.user_response
 
         user = self.user.get_user_by_id(
             "usr-f1801430-51e1-4718-8fca-778887087bad")
@@ -65,9 +70,7 @@ class UserTest(TestCase):
         self.assertIsInstance(user, User)
 
     def test_get_my_id(self):
-        self.mock_get.return_value = Mock()
-        self.mock_get.return_value.json.return_value = self.data
-        self.mock_get.return_value.status_code = 200
+        self.mock_get.return_value = self.user_response
 
         test = self.user.get_my_id()
         reference = "usr-f1801430-51e1-4718-8fca-778887087bad"
@@ -76,9 +79,7 @@ class UserTest(TestCase):
 
     def test_create_user(self):
         reference = "usr-2a28ca65-2c2f-41e7-9aa5-e829830c6c71"
-        self.mock_post.return_value = Mock()
-        self.mock_post.return_value.text = reference
-        self.mock_post.return_value.status_code = 200
+        self.mock_post.return_value = self.create_user_response
 
         test = self.user.create_user(
             user="newuser",
@@ -92,12 +93,7 @@ class UserTest(TestCase):
         self.assertEqual(reference, test)
 
     def test_create_team(self):
-        with open(os.path.join(DATA_PATH, "newTeam.json")) as handle:
-            data = json.load(handle)
-
-        self.mock_post.return_value = Mock()
-        self.mock_post.return_value.json.return_value = data
-        self.mock_post.return_value.status_code = 201
+        self.mock_post.return_value = self.new_team_response
 
         team = self.user.create_team(
             description="test description",
@@ -106,12 +102,7 @@ class UserTest(TestCase):
         self.assertIsInstance(team, Team)
 
     def read_teams(self):
-        with open(os.path.join(DATA_PATH, "userTeams.json")) as handle:
-            data = json.load(handle)
-
-        self.mock_get.return_value = Mock()
-        self.mock_get.return_value.json.return_value = data
-        self.mock_get.return_value.status_code = 200
+        self.mock_get.return_value = self.teams_response
 
     def test_get_teams(self):
         # initialize
@@ -120,13 +111,10 @@ class UserTest(TestCase):
         # get user teams
         teams = self.user.get_teams()
 
-        # teams is now a generator
-        self.assertIsInstance(teams, types.GeneratorType)
-        teams = list(teams)
+        # there's only one team
+        team = next(teams)
+        self.assertRaises(StopIteration, next, teams)
 
-        self.assertEqual(len(teams), 1)
-
-        team = teams[0]
         self.assertIsInstance(team, Team)
 
     def test_get_team_by_name(self):
@@ -137,20 +125,15 @@ class UserTest(TestCase):
         team = self.user.get_team_by_name("subs.dev-team-1")
         self.assertIsInstance(team, Team)
 
-        # get a team I dont't belong to
+        # get a team I don't belong to
         self.assertRaisesRegex(
             NameError,
-            "team: .* not found",
+            TEAM_NOT_FOUND,
             self.user.get_team_by_name,
             "subs.dev-team-2")
 
     def test_add_user2team(self):
-        with open(os.path.join(DATA_PATH, "user2team.json")) as handle:
-            data = json.load(handle)
-
-        self.mock_put.return_value = Mock()
-        self.mock_put.return_value.json.return_value = data
-        self.mock_put.return_value.status_code = 200
+        self.mock_put.return_value = self.user2team_response
 
         domain = self.user.add_user_to_team(
             user_id='dom-36ccaae5-1ce1-41f9-b65c-d349994e9c80',
@@ -159,40 +142,39 @@ class UserTest(TestCase):
         self.assertIsInstance(domain, Domain)
 
     def read_myDomain(self):
-        with open(os.path.join(DATA_PATH, "myDomain.json")) as handle:
-            data = json.load(handle)
-
-        self.mock_get.return_value = Mock()
-        self.mock_get.return_value.json.return_value = data
-        self.mock_get.return_value.status_code = 200
+        self.mock_get.return_value = self.domains_response
 
     def test_get_domains(self):
         # initialize
         self.read_myDomain()
 
-        # get user teams
+        # get user domains
         domains = self.user.get_domains()
 
-        # domains is now a generator
-        self.assertIsInstance(domains, types.GeneratorType)
-        domains = list(domains)
+        # there are two domains
+        for _ in range(2):
+            domain = next(domains)
+            self.assertIsInstance(domain, Domain)
 
-        self.assertEqual(len(domains), 2)
+        self.assertRaises(StopIteration, next, domains)
 
-        for domain in domains:
-            self.assertIsInstance(domain, Domain)
+    def test_return_generators(self):
+        """Methods returning many objects are generators"""
+
+        self.assertIsInstance(self.user.get_teams(), types.GeneratorType)
+        self.assertIsInstance(self.user.get_domains(), types.GeneratorType)
 
     def test_get_domain_by_name(self):
         # initialize
         self.read_myDomain()
 
-        # get a specific team
+        # get a specific domain
         domain = self.user.get_domain_by_name("subs.test-team-1")
         self.assertIsInstance(domain, Domain)
 
-        # get a team I dont't belong to
+        # get a domain I don't belong to
         self.assertRaisesRegex(
             NameError,
-            "domain: .* not found",
+            DOMAIN_NOT_FOUND,
             self.user.get_domain_by_name,
             "subs.dev-team-2")